@@ -8,6 +8,7 @@ import imageio_ffmpeg
 import subprocess
 import re
 import time
+import language_detect
 
 # Page Config
 st.set_page_config(
@@ -140,6 +141,15 @@ def main():
                     lang_map = {"Korean": "ko", "English": "en", "Japanese": "ja", "Chinese": "zh"}
                     if language in lang_map:
                         transcribe_args["language"] = lang_map[language]
+                else:
+                    # Cheap pre-pass so the main model doesn't run its own detection
+                    status_text.text("Detecting language...")
+                    detected, source, fingerprint = language_detect.detect_language(
+                        video_path, duration, model_size,
+                        lambda: load_model(language_detect.DETECTOR_MODEL_SIZE, device, compute_type),
+                        lambda m: st.info(m.strip()))
+                    if detected:
+                        transcribe_args["language"] = detected
                 
                 # Construct Prompt
                 final_prompt = initial_prompt if initial_prompt else ""
@@ -167,7 +177,13 @@ def main():
                 status_text.text("Transcribing... This may take a while.")
                 segments_generator, info = model.transcribe(video_path, **transcribe_args)
                 
-                st.success(f"Detected language: {info.language.upper()} (Probability: {info.language_probability:.2f})")
+                if language == "Auto" and "language" not in transcribe_args:
+                    language_detect.store_full_detection(fingerprint, info.language, info.language_probability, lambda m: st.info(m.strip()))
+                    st.success(f"Detected language: {info.language.upper()} (Probability: {info.language_probability:.2f})")
+                elif language == "Auto":
+                    st.success(f"Using language: {info.language.upper()} (from {source})")
+                else:
+                    st.success(f"Using language: {info.language.upper()}")
                 
                 # Real-time preview container
                 preview_placeholder = st.empty()
@@ -0,0 +1,191 @@
+import os
+import json
+import hashlib
+import subprocess
+import threading
+import numpy as np
+import imageio_ffmpeg
+from faster_whisper import WhisperModel
+
+# Language-identification pre-pass used when Language is set to "Auto".
+# A small model listens to a few short windows of the file instead of letting
+# the (possibly large) main model run detection, and the result is cached per
+# audio fingerprint so reruns and batch jobs skip detection entirely.
+
+DETECTOR_MODEL_SIZE = "base"
+MODEL_SIZES = ["tiny", "base", "small", "medium", "large-v3"]
+SAMPLE_RATE = 16000
+WINDOW_SECONDS = 10
+MAX_WINDOWS = 4
+CONFIDENCE_THRESHOLD = 0.7
+SILENCE_RMS = 0.01  # Windows quieter than this are treated as non-speech
+
+CACHE_PATH = os.path.join("cache", "language_cache.json")
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+
+_cache_lock = threading.Lock()
+_detector_lock = threading.Lock()
+_detector_models = {}
+
+
+def audio_fingerprint(path):
+    """Hash file size plus head/middle/tail chunks; cheap even for multi-GB videos."""
+    size = os.path.getsize(path)
+    sha = hashlib.sha256(str(size).encode("utf-8"))
+    with open(path, "rb") as f:
+        if size <= HASH_CHUNK_SIZE * 3:
+            sha.update(f.read())
+        else:
+            for offset in (0, size // 2, size - HASH_CHUNK_SIZE):
+                f.seek(offset)
+                sha.update(f.read(HASH_CHUNK_SIZE))
+    return sha.hexdigest()
+
+
+def _read_cache():
+    try:
+        with open(CACHE_PATH, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _is_valid_entry(entry):
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("language"), str)
+        and isinstance(entry.get("probability"), (int, float))
+        and isinstance(entry.get("source"), str)
+    )
+
+
+def get_cached_language(fingerprint):
+    """Return the cached entry for this file, or None (malformed entries count as a miss)."""
+    with _cache_lock:
+        entry = _read_cache().get(fingerprint)
+    return entry if _is_valid_entry(entry) else None
+
+
+def store_language(fingerprint, language, probability, source):
+    with _cache_lock:
+        cache = _read_cache()
+        cache[fingerprint] = {"language": language, "probability": round(float(probability), 4), "source": source}
+        try:
+            os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+            with open(CACHE_PATH, "w", encoding="utf-8") as f:
+                json.dump(cache, f, indent=2)
+        except OSError as e:
+            print(f"Failed to write language cache: {e}")
+
+
+def store_full_detection(fingerprint, language, probability, log=print):
+    """Cache the main model's own detection, but only when it is confident enough to reuse."""
+    if probability >= CONFIDENCE_THRESHOLD:
+        store_language(fingerprint, language, probability, "full")
+    else:
+        log(f"Detection confidence {probability:.2f} is low; not caching language.\n")
+
+
+def uses_detector(model_size):
+    """Sampling only pays off when the main model is larger than the detector."""
+    if model_size not in MODEL_SIZES:
+        return True
+    return MODEL_SIZES.index(model_size) > MODEL_SIZES.index(DETECTOR_MODEL_SIZE)
+
+
+def get_detector_model(device, compute_type):
+    # Kept for the lifetime of the process so batches only load it once
+    key = (device, compute_type)
+    with _detector_lock:
+        if key not in _detector_models:
+            _detector_models[key] = WhisperModel(DETECTOR_MODEL_SIZE, device=device, compute_type=compute_type)
+        return _detector_models[key]
+
+
+def extract_window(video_path, start, length=WINDOW_SECONDS):
+    """Decode a short mono 16 kHz window with ffmpeg, seeking instead of decoding the whole file."""
+    ffmpeg_exe = imageio_ffmpeg.get_ffmpeg_exe()
+    creationflags = 0x08000000 if os.name == 'nt' else 0
+    result = subprocess.run(
+        [ffmpeg_exe, "-nostdin", "-loglevel", "error",
+         "-ss", f"{start:.2f}", "-t", str(length), "-i", video_path,
+         "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "-"],
+        creationflags=creationflags,
+        stdin=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+    return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+
+
+def candidate_offsets(duration):
+    if duration <= 0:
+        return [0, 30, 60, 90, 120]
+    if duration <= WINDOW_SECONDS * MAX_WINDOWS:
+        return [i * WINDOW_SECONDS for i in range(MAX_WINDOWS) if i * WINDOW_SECONDS < duration]
+    # Spread across the file, alternating from the middle so speech is found early
+    fractions = [0.5, 0.3, 0.7, 0.15, 0.85, 0.4, 0.6]
+    return [max(0, duration * f - WINDOW_SECONDS / 2) for f in fractions]
+
+
+def sample_language(video_path, duration, model):
+    """Vote over a few speech windows with the small model. Returns (language, confidence) or None."""
+    votes = {}
+    windows = 0
+    for start in candidate_offsets(duration):
+        if windows >= MAX_WINDOWS:
+            break
+        audio = extract_window(video_path, start)
+        if audio.size < SAMPLE_RATE or np.sqrt(np.mean(audio ** 2)) < SILENCE_RMS:
+            continue
+        # Language detection runs eagerly inside transcribe; the segment generator is never consumed
+        _, info = model.transcribe(audio, beam_size=1, vad_filter=False, without_timestamps=True)
+        votes[info.language] = votes.get(info.language, 0.0) + info.language_probability
+        windows += 1
+
+    if not windows:
+        return None
+    language = max(votes, key=votes.get)
+    # Windows that voted for another language count as zero confidence
+    return language, votes[language] / windows
+
+
+def detect_language(video_path, duration, model_size, load_detector, log=print):
+    """
+    Resolve the language for an "Auto" run before the main model is used.
+    Returns (language, source, fingerprint); language is None when the main
+    model should detect it itself. source is "cache" or "sampled".
+    load_detector is only called when the main model is larger than the
+    detector, so small main models never pay for a second model.
+    """
+    fingerprint = audio_fingerprint(video_path)
+    cached = get_cached_language(fingerprint)
+    if cached:
+        log(f"Language cache hit: '{cached['language']}' ({cached['probability']:.2f}, {cached['source']})\n")
+        return cached["language"], "cache", fingerprint
+
+    if not uses_detector(model_size):
+        # Detection on a tiny/base model is already cheap; sampling would only add work
+        log(f"Language not cached; '{model_size}' model will detect it.\n")
+        return None, None, fingerprint
+
+    log(f"Sampling language with '{DETECTOR_MODEL_SIZE}' model...\n")
+    try:
+        result = sample_language(video_path, duration, load_detector())
+    except Exception as e:
+        log(f"Language pre-pass failed: {e}\n")
+        result = None
+
+    if result is None:
+        log("No usable speech in sampled windows. Falling back to full detection.\n")
+        return None, None, fingerprint
+
+    language, confidence = result
+    if confidence < CONFIDENCE_THRESHOLD:
+        log(f"Pre-pass unsure ('{language}' {confidence:.2f}). Falling back to full detection.\n")
+        return None, None, fingerprint
+
+    log(f"Pre-pass detected '{language}' with confidence {confidence:.2f}\n")
+    store_language(fingerprint, language, confidence, "sampled")
+    return language, "sampled", fingerprint
@@ -17,6 +17,7 @@ import re
 import time
 import io
 import torch
+import language_detect
 
 import warnings
 # Suppress specific PyTorch warning usually seen in Nightly builds with older Whisper versions
@@ -260,6 +261,13 @@ class SubtitleGeneratorApp:
                 if code:
                     transcribe_args["language"] = code
                     self.log(f"Forcing language: {language_selection} ({code})\n")
+            else:
+                # Cheap pre-pass so the main model doesn't run its own detection
+                detected, source, fingerprint = language_detect.detect_language(
+                    video_path, self.video_duration, model_size,
+                    lambda: language_detect.get_detector_model(device, compute_type), self.log)
+                if detected:
+                    transcribe_args["language"] = detected
             
             # Construct Prompt
             final_prompt = initial_prompt if initial_prompt else ""
@@ -293,7 +301,13 @@ class SubtitleGeneratorApp:
             # faster-whisper returns a generator
             segments_generator, info = model.transcribe(video_path, **transcribe_args)
             
-            self.log(f"Detected language '{info.language}' with probability {info.language_probability:.2f}\n")
+            if language_selection == "Auto" and "language" not in transcribe_args:
+                self.log(f"Detected language '{info.language}' with probability {info.language_probability:.2f}\n")
+                language_detect.store_full_detection(fingerprint, info.language, info.language_probability, self.log)
+            elif language_selection == "Auto":
+                self.log(f"Using language '{info.language}' (from {source})\n")
+            else:
+                self.log(f"Using language '{info.language}'\n")
             self.log(f"Starting separate loop...\n")
 
             segments = []